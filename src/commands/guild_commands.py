@@ -17,7 +17,9 @@
 # along with this program.  If not, see <https://www.gnu.org/licenses/gpl-3.0.html>.
 
 from __future__ import annotations
-from typing import Dict, Optional
+from typing import Any, Awaitable, Callable, Dict, Optional
+import asyncio
+import functools
 
 import discord
 from discord import app_commands
@@ -25,33 +27,88 @@ from enum import Enum
 from utils.db import GuildSettings, Region, Category, Languages
 
 
-class SubscriptionKey(str, Enum):
-    # Region values
-    North_America = Region.North_America.value
-    South_America = Region.South_America.value
-    Middle_East   = Region.Middle_East.value
-    Oceania       = Region.Oceania.value
-    East_Asia     = Region.East_Asia.value
-    South_Asia    = Region.South_Asia.value
-    Central_Asia  = Region.Central_Asia.value
-    Europe        = Region.Europe.value
-    Africa        = Region.Africa.value
-    Global        = Region.Global.value
-
-    # Category values
-    World         = Category.WORLD.value
-    Interviews    = Category.INTERVIEWS.value
-    Opinion       = Category.OPINION.value
-    Articles      = Category.ARTICLES.value
-    Sports        = Category.SPORTS.value
-    Editorials    = Category.EDITORIALS.value
-    Other         = Category.OTHER.value
-    
-    # Language values
-    French = Languages.FR.value
-    Chinese = Languages.CHINESE.value
-    Japanese = Languages.JAP.value
-    Turkish = Languages.TURK.value
+# Every Region, Category and Language value is a valid subscription key,
+# so new enum members show up here without touching this file
+_SUBSCRIPTION_KEYS: Dict[str, str] = {}
+_SUBSCRIPTION_KEYS.update((r.name, r.value) for r in Region)
+_SUBSCRIPTION_KEYS.update((c.name, c.value) for c in Category)
+_SUBSCRIPTION_KEYS.update((l.name, l.value) for l in Languages)
+
+SubscriptionKey = Enum("SubscriptionKey", _SUBSCRIPTION_KEYS, type=str, module=__name__)
+
+
+_REGION_VALUES = frozenset(r.value for r in Region)
+_CATEGORY_VALUES = frozenset(c.value for c in Category)
+_KEY_VALUES = _REGION_VALUES | _CATEGORY_VALUES
+
+_MANAGE_GUILD_BIT = discord.Permissions.manage_guild.flag
+
+_MSG_NO_PERM = "❌ You don’t have Manage Server permission."
+_MSG_NOT_IN_GUILD = "❌ This command can only be used in a server."
+_MSG_NOT_REGISTERED = "⚠️ This guild is not subscribed to anything yet. Use `/add` first."
+_MSG_UPDATE_OK = "✅ Subscription updated: "
+_MSG_SETUP_OK = "✅ Guild successfully subscribed.\n• Key: `{}`\n• News Channel ID: `{}`"
+
+_VIEW_EMBED_TEMPLATE: Dict[str, Any] = {
+    "title": "📰 Guild News Subscriptions",
+    "color": discord.Colour.blurple().value,
+}
+
+_SUBSCRIPTION_CHOICES = [
+    app_commands.Choice(name=k.name, value=k.value) for k in SubscriptionKey
+]
+
+_Handler = Callable[..., Awaitable[None]]
+
+
+def with_defer(ephemeral: bool = True) -> Callable[[_Handler], _Handler]:
+    """
+    Acknowledge the interaction as soon as the handler starts so database work
+    can't push us past Discord's 3 second response deadline. The ack runs as a
+    task alongside the handler's first queries; handlers wrapped with this must
+    reply through `_reply`, which waits for the ack before using the followup.
+    """
+    def decorator(func: _Handler) -> _Handler:
+        @functools.wraps(func)
+        async def wrapper(self: Any, interaction: discord.Interaction, *args: Any, **kwargs: Any) -> None:
+            ack = asyncio.create_task(interaction.response.defer(ephemeral=ephemeral))
+            interaction.extras["ack"] = ack
+            try:
+                await func(self, interaction, *args, **kwargs)
+            finally:
+                await ack
+        return wrapper
+    return decorator
+
+
+async def _reply(interaction: discord.Interaction, *args: Any, **kwargs: Any) -> None:
+    """Send a followup once the deferred ack from `with_defer` has gone out."""
+    await interaction.extras["ack"]
+    await interaction.followup.send(*args, **kwargs)
+
+
+def require_manage_guild(func: _Handler) -> _Handler:
+    """Reject callers without Manage Server. Must sit under `with_defer` and `require_guild_scope`."""
+    @functools.wraps(func)
+    async def wrapper(self: Any, interaction: discord.Interaction, *args: Any, **kwargs: Any) -> None:
+        author: discord.Member = interaction.user  # type: ignore
+        if not author.guild_permissions.value & _MANAGE_GUILD_BIT:
+            await _reply(interaction, _MSG_NO_PERM, ephemeral=True)
+            return
+        await func(self, interaction, *args, **kwargs)
+    return wrapper
+
+
+def require_guild_scope(func: _Handler) -> _Handler:
+    """Reject invocations outside a server. Must sit under `with_defer`."""
+    @functools.wraps(func)
+    async def wrapper(self: Any, interaction: discord.Interaction, *args: Any, **kwargs: Any) -> None:
+        if interaction.guild_id is None:
+            await _reply(interaction, _MSG_NOT_IN_GUILD, ephemeral=True)
+            return
+        await func(self, interaction, *args, **kwargs)
+    return wrapper
+
 
 class GuildCommands(app_commands.Group):
     """Group of slash commands to manage this guild’s news configuration."""
@@ -59,38 +116,25 @@ class GuildCommands(app_commands.Group):
     @app_commands.command(name="setup", description="Register this guild for news posts.")
     @app_commands.describe(
         key="Either an EMC Region or a News Category (choose one)",
-        news_channel="The Discord channel ID where news will be posted",
+        news_channel="The Discord channel where news will be posted",
     )
-    @app_commands.choices(key=[
-        app_commands.Choice(name=k.name, value=k.value) for k in SubscriptionKey
-    ])
+    @app_commands.choices(key=_SUBSCRIPTION_CHOICES)
+    @with_defer(ephemeral=True)
+    @require_guild_scope
+    @require_manage_guild
     async def setup(
         self,
         interaction: discord.Interaction,
         key: SubscriptionKey,
-        news_channel: str,
+        news_channel: discord.TextChannel,
     ) -> None:
-        author: discord.Member = interaction.user  # type: ignore
-        # Permission check
-        if not getattr(author.guild_permissions, "manage_guild", False):
-            await interaction.response.send_message(
-                "❌ You don’t have Manage Server permission.", ephemeral=True
-            )
-            return
-
-
-        if interaction.guild_id is None:
-            await interaction.response.send_message(
-                "❌ This command can only be used in a server.", ephemeral=True
-            )
-            return
-
         # Check if already registered under this exact key
         channels_map: Optional[Dict[str, int]] = await GuildSettings.get_channels_for_guild(
             interaction.guild_id
         )
         if channels_map is not None and key.value in channels_map:
-            await interaction.response.send_message(
+            await _reply(
+                interaction,
                 f"⚠️ This guild is already subscribed to `{key.value}`. Use `/update` if you want to change the channel.",
                 ephemeral=True
             )
@@ -100,69 +144,54 @@ class GuildCommands(app_commands.Group):
         await GuildSettings.add_or_update_channel(
             guild_id=interaction.guild_id,
             key=key.value,
-            channel_id=int(news_channel)
+            channel_id=news_channel.id
         )
 
-        await interaction.response.send_message(
-            f"✅ Guild successfully subscribed.\n• Key: `{key.value}`\n• News Channel ID: `{news_channel}`"
-        )
+        await _reply(interaction, _MSG_SETUP_OK.format(key.value, news_channel.id))
 
     @app_commands.command(name="view", description="View this guild’s current news configuration.")
+    @with_defer(ephemeral=True)
+    @require_guild_scope
     async def view(self, interaction: discord.Interaction) -> None:
-        if interaction.guild_id is None:
-            await interaction.response.send_message(
-                "❌ This command can only be used in a server.", ephemeral=True
-            )
-            return
-
         channels_map: Optional[Dict[str, int]] = await GuildSettings.get_channels_for_guild(
             interaction.guild_id
         )
         if channels_map is None:
-            await interaction.response.send_message(
-                "⚠️ This guild is not subscribed to anything yet. Use `/add` to subscribe.",
-                ephemeral=True
-            )
+            await _reply(interaction, _MSG_NOT_REGISTERED, ephemeral=True)
             return
 
-        embed = discord.Embed(
-            title="📰 Guild News Subscriptions",
-            colour=discord.Colour.blurple()
-        )
-
-        # Show each Region or Category → channel ID
-        for key_name, chan_id in channels_map.items():
-            embed.add_field(name=key_name, value=str(chan_id), inline=False)
-
-        embed.set_footer(text=f"Guild ID: {interaction.guild_id}")
-        await interaction.response.send_message(embed=embed)
+        # Show each Region or Category → channel mention
+        fields = [
+            {"name": key_name, "value": f"<#{chan_id}>", "inline": False}
+            for key_name, chan_id in channels_map.items()
+        ]
+        embed = discord.Embed.from_dict({
+            **_VIEW_EMBED_TEMPLATE,
+            "fields": fields,
+            "footer": {"text": f"Guild ID: {interaction.guild_id}"},
+        })
+        await _reply(interaction, embed=embed)
 
     @app_commands.command(name="update", description="Update this guild’s subscription.")
     @app_commands.describe(
         key="(Optional) New key (Region or Category). Leave blank to only change channel.",
         news_channel="(Optional) New channel ID for that key."
     )
-    @app_commands.choices(key=[
-        app_commands.Choice(name=k.name, value=k.value) for k in SubscriptionKey
-    ])
+    @app_commands.choices(key=_SUBSCRIPTION_CHOICES)
+    @with_defer(ephemeral=True)
+    @require_guild_scope
+    @require_manage_guild
     async def update(
         self,
         interaction: discord.Interaction,
         key: Optional[SubscriptionKey] = None,
         news_channel: Optional[int] = None,
     ) -> None:
-        author: discord.Member = interaction.user  # type: ignore
-
-        # Permission check
-        if not getattr(author.guild_permissions, "manage_guild", False):
-            await interaction.response.send_message(
-                "❌ You don’t have Manage Server permission.", ephemeral=True
-            )
-            return
-
-        if interaction.guild_id is None:
-            await interaction.response.send_message(
-                "❌ This command can only be used in a server.", ephemeral=True
+        if key is None and news_channel is None:
+            await _reply(
+                interaction,
+                "⚠️ Please specify at least one field to update (either `key` or `news_channel`).",
+                ephemeral=True
             )
             return
 
@@ -170,41 +199,33 @@ class GuildCommands(app_commands.Group):
             interaction.guild_id
         )
         if channels_map is None:
-            await interaction.response.send_message(
-                "⚠️ This guild is not subscribed to anything yet. Use `/add` first.",
-                ephemeral=True
-            )
-            return
-
-        if key is None and news_channel is None:
-            await interaction.response.send_message(
-                "⚠️ Please specify at least one field to update (either `key` or `news_channel`).",
-                ephemeral=True
-            )
+            await _reply(interaction, _MSG_NOT_REGISTERED, ephemeral=True)
             return
 
         updated_fields: list[str] = []
 
-        # If key changed, remove old key and later (if channel provided) create the new mapping
+        # If key changed, drop the old keys and (if channel provided) add the new mapping
         if key is not None:
+            new_map = dict(channels_map)
             # If the guild was subscribed to this same key already, skip removal
             if key.value not in channels_map:
                 # Otherwise remove every existing Region/Category key
-                for existing_key in list(channels_map.keys()):
-                    if existing_key in {r.value for r in Region} or existing_key in {c.value for c in Category}:
-                        await GuildSettings.remove_channel(interaction.guild_id, existing_key)
+                for existing_key in channels_map:
+                    if existing_key in _KEY_VALUES:
+                        del new_map[existing_key]
                         updated_fields.append(f"removed key `{existing_key}`")
 
-            # If news_channel provided, immediately re-add under new key
             if news_channel is not None:
-                await GuildSettings.add_or_update_channel(
-                    guild_id=interaction.guild_id,
-                    key=key.value,
-                    channel_id=news_channel
-                )
+                new_map[key.value] = news_channel
                 updated_fields.append(f"added key `{key.value}` → `{news_channel}`")
-            else:
-                await interaction.response.send_message(
+
+            # Removals and the new key go out as one write
+            if new_map != channels_map:
+                await GuildSettings.replace_channels(interaction.guild_id, new_map)
+
+            if news_channel is None:
+                await _reply(
+                    interaction,
                     f"ℹ️ Key updated to `{key.value}`. Please also specify `news_channel` with `/update` to set channel ID.",
                     ephemeral=True
                 )
@@ -212,11 +233,9 @@ class GuildCommands(app_commands.Group):
 
         # If only channel changed (and key was None), find existing key to update
         if news_channel is not None and key is None:
-            existing_key: Optional[str] = None
-            for k in channels_map.keys():
-                if k in {r.value for r in Region} or k in {c.value for c in Category}:
-                    existing_key = k
-                    break
+            existing_key: Optional[str] = next(
+                (k for k in channels_map if k in _KEY_VALUES), None
+            )
 
             if existing_key is not None:
                 await GuildSettings.add_or_update_channel(
@@ -226,42 +245,31 @@ class GuildCommands(app_commands.Group):
                 )
                 updated_fields.append(f"updated channel for `{existing_key}` → `{news_channel}`")
             else:
-                await interaction.response.send_message(
+                await _reply(
+                    interaction,
                     "⚠️ No existing key found to update channel. Use `/add` first.", ephemeral=True
                 )
                 return
 
-        await interaction.response.send_message(
-            f"✅ Subscription updated: " + ", ".join(updated_fields)
-        )
+        await _reply(interaction, _MSG_UPDATE_OK + ", ".join(updated_fields))
 
     @app_commands.command(name="remove", description="Unsubscribe this guild from all news.")
+    @with_defer(ephemeral=True)
+    @require_guild_scope
+    @require_manage_guild
     async def remove(self, interaction: discord.Interaction) -> None:
-        author: discord.Member = interaction.user  # type: ignore
-
-        # Permission check
-        if not getattr(author.guild_permissions, "manage_guild", False):
-            await interaction.response.send_message(
-                "❌ You don’t have Manage Server permission.", ephemeral=True
-            )
-            return
-
-        if interaction.guild_id is None:
-            await interaction.response.send_message(
-                "❌ This command can only be used in a server.", ephemeral=True
-            )
-            return
-
-        if await GuildSettings.get_channels_for_guild(interaction.guild_id) is None:
-            await interaction.response.send_message(
+        # Delete entire JSON mapping for this guild; the row count tells us if there was one
+        deleted = await GuildSettings.filter(guild_id=interaction.guild_id).delete()
+        GuildSettings.invalidate_channels_cache(interaction.guild_id)
+        if not deleted:
+            await _reply(
+                interaction,
                 "⚠️ This guild is not subscribed to anything, nothing to remove.", ephemeral=True
             )
             return
 
-        # Delete entire JSON mapping for this guild
-        await GuildSettings.filter(guild_id=interaction.guild_id).delete()
-
-        await interaction.response.send_message(
+        await _reply(
+            interaction,
             "🗑️ All subscriptions removed for this guild."
         )
 
@@ -18,22 +18,69 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <https://www.gnu.org/licenses/gpl-3.0.html>.
 from __future__ import annotations
-from typing import Dict, Sequence, Optional, Any, List
+from typing import Dict, Sequence, Optional, Any, List, Tuple, Coroutine
 
 import discord
 from discord import app_commands
-import os
+import asyncio
+import logging
 
 from utils.db import NewsSchema, ReporterSchema, Region, Category, GuildSettings, Languages
+from utils.config import get_news_config
 
-# Load environment variables (use os.environ[...] to ensure non-None)
-GUILD_ID = discord.Object(id=int(os.environ["GUILD_ID"]))
-NEWS_CHANNEL_ID = int(os.environ["NEWS_CHANNEL_ID"])
-ADMIN_ID = [
-    s.strip()
-    for s in str(os.environ.get("ADMIN_ID", "")).split(",")
-    if s.strip()
-]
+logger = logging.getLogger(__name__)
+
+
+class _ChannelResolver:
+    """
+    Memoizes guild and text channel lookups for the duration of one command,
+    since broadcasts and message_ids mostly repeat the same guilds.
+    """
+
+    def __init__(self, client: discord.Client) -> None:
+        self.client = client
+        self._guilds: Dict[int, Optional[discord.Guild]] = {}
+        self._channels: Dict[Tuple[int, int], Optional[discord.TextChannel]] = {}
+
+    def guild(self, guild_id: int) -> Optional[discord.Guild]:
+        if guild_id not in self._guilds:
+            self._guilds[guild_id] = self.client.get_guild(guild_id)
+        return self._guilds[guild_id]
+
+    def channel(self, guild: discord.Guild, channel_id: int) -> Optional[discord.TextChannel]:
+        key = (guild.id, channel_id)
+        if key not in self._channels:
+            channel = guild.get_channel(channel_id)
+            self._channels[key] = channel if isinstance(channel, discord.TextChannel) else None
+        return self._channels[key]
+
+
+async def _delete_in_channel(channel: discord.TextChannel, message_ids: List[int]) -> None:
+    """
+    Delete messages with the bulk endpoint, 100 at a time. Bulk deletes are
+    refused for messages older than 14 days (or without Manage Messages), so
+    those batches fall back to one DELETE per message.
+    """
+    for start in range(0, len(message_ids), 100):
+        batch = message_ids[start:start + 100]
+        try:
+            await channel.delete_messages([discord.Object(id=m) for m in batch])
+        except discord.HTTPException:
+            results = await asyncio.gather(
+                *(channel.get_partial_message(m).delete() for m in batch),
+                return_exceptions=True,
+            )
+            for result in results:
+                if isinstance(result, BaseException) and not isinstance(result, discord.HTTPException):
+                    raise result
+
+
+async def _send_embeds(interaction: discord.Interaction, embeds: List[discord.Embed]) -> None:
+    """Send embeds as ephemeral followups, packing up to 10 into each message."""
+    await asyncio.gather(*(
+        interaction.followup.send(embeds=embeds[i:i + 10], ephemeral=True)
+        for i in range(0, len(embeds), 10)
+    ))
 
 
 class NewsCommands(app_commands.Group):
@@ -61,20 +108,25 @@ class NewsCommands(app_commands.Group):
         region: Region = Region.Global,
         language: Languages = Languages.EN,
     ) -> None:
-        # 1) Permission check: must be a registered reporter
+        # Ack right away; the broadcast below can take longer than Discord's 3s window
+        await interaction.response.defer(ephemeral=True)
+
+        # 1) Validate input before touching the database
+        if not credit.isdecimal():
+            await interaction.followup.send(
+                "❌ `credit` must be a numeric user id.", ephemeral=True
+            )
+            return
+
+        # 2) Permission check: must be a registered reporter
         reporter = await ReporterSchema.get_or_none(user_id=interaction.user.id)
         if reporter is None:
-            await interaction.response.send_message(
+            await interaction.followup.send(
                 "🚫 You are not registered as a reporter.", ephemeral=True
             )
             return
-        try:
-            _f = int(credit)
-        except Exception:
-            await interaction.response.send_message("Use a fucking user id")
-            return
 
-        # 2) Create & save the NewsSchema row
+        # 3) Create & save the NewsSchema row
         news = await NewsSchema.create_safe(
             title=title,
             description=description,
@@ -87,88 +139,95 @@ class NewsCommands(app_commands.Group):
             language=language.value,
         )
         if news is None:
-            await interaction.response.send_message("⚠️ Failed to create news item.", ephemeral=True)
+            await interaction.followup.send("⚠️ Failed to create news item.", ephemeral=True)
             return
 
         embed = news.to_embed()
 
-        # 3) Send to the main guild's news channel
-        main_guild = interaction.client.get_guild(GUILD_ID.id)
+        # 4) Send to the main guild's news channel
+        config = get_news_config()
+        main_guild = interaction.client.get_guild(config.guild_id)
         if main_guild is None:
-            await interaction.response.send_message("⚠️ News saved but main guild not found.", ephemeral=True)
+            await interaction.followup.send("⚠️ News saved but main guild not found.", ephemeral=True)
             return
 
-        main_channel = main_guild.get_channel(NEWS_CHANNEL_ID)
+        main_channel = main_guild.get_channel(config.news_channel_id)
         if not isinstance(main_channel, discord.TextChannel):
-            await interaction.response.send_message("⚠️ News saved but main news channel is invalid.", ephemeral=True)
+            await interaction.followup.send("⚠️ News saved but main news channel is invalid.", ephemeral=True)
             return
 
-        main_msg = await main_channel.send(embed=embed)
-        await main_msg.publish()
-        news.message_ids = [{
+        # Load subscriptions while the main post is in flight
+        mappings_task = asyncio.create_task(GuildSettings.all_by_key())
+
+        try:
+            main_msg = await main_channel.send(embed=embed)
+            await main_msg.publish()
+        except BaseException:
+            # don't leave the lookup dangling (or its error unretrieved) if the post fails
+            mappings_task.cancel()
+            await asyncio.gather(mappings_task, return_exceptions=True)
+            raise
+        main_entry = {
             "guild_id": main_guild.id,
-            "channel_id": NEWS_CHANNEL_ID,
+            "channel_id": config.news_channel_id,
             "message_id": main_msg.id,
-        }]
-        await news.save()
+        }
 
+        # 5) Bump the reporter's post count and collect the subscription map together
         reporter.posts += 1
-        await reporter.save()
+        _, all_mappings = await asyncio.gather(reporter.save(), mappings_task)
 
-        # 4) Fetch all subscriptions
-        all_mappings = await GuildSettings.all_by_key()
-
-        # 6) Collect subscribers
-        subscribers = []
-
-        def extend_subscribers(key: str, label: str):
-            if key in all_mappings:
-                subscribers.extend(all_mappings[key])
-
-        extend_subscribers(region.value, "region")
-        extend_subscribers(category.value, "category")
-        extend_subscribers(language.value, "language")
-
-        # 7) Deduplicate by (guild_id, channel_id)
-        seen = set()
-        unique_subscribers = []
-        for entry in subscribers:
-            key = (entry["guild_id"], entry["channel_id"])
-            if key not in seen:
-                seen.add(key)
-                unique_subscribers.append(entry)
+        # 6) Collect subscribers, deduplicated by (guild_id, channel_id) in one pass
+        candidates = (
+            all_mappings.get(region.value, ())
+            + all_mappings.get(category.value, ())
+            + all_mappings.get(language.value, ())
+        )
+        unique_subscribers = list(
+            {(e["guild_id"], e["channel_id"]): e for e in candidates}.values()
+        )
 
-        # 8) Send the embed to each unique subscriber
+        # 7) Send the embed to each unique subscriber concurrently
+        resolver = _ChannelResolver(interaction.client)
+        sends: List[Coroutine[Any, Any, discord.Message]] = []
+        targets: List[Tuple[int, int]] = []
         for sub in unique_subscribers:
             guild_id, channel_id = sub["guild_id"], sub["channel_id"]
 
             # Only skip posting to the main news channel itself
-            if guild_id == GUILD_ID.id and channel_id == NEWS_CHANNEL_ID:
+            if guild_id == config.guild_id and channel_id == config.news_channel_id:
                 continue
 
-            guild = interaction.client.get_guild(guild_id)
+            guild = resolver.guild(guild_id)
             if guild is None:
-                print(f"⚠️ Guild {guild_id} not found.")
+                logger.warning("Guild %s not found.", guild_id)
                 continue
 
-            channel = guild.get_channel(channel_id)
-            if not isinstance(channel, discord.TextChannel):
-                print(f"⚠️ Channel {channel_id} in guild {guild_id} is not a valid TextChannel.")
+            channel = resolver.channel(guild, channel_id)
+            if channel is None:
+                logger.warning("Channel %s in guild %s is not a valid TextChannel.", channel_id, guild_id)
                 continue
 
-            try:
-                msg = await channel.send(embed=embed)
-                news.message_ids.append({
-                    "guild_id": guild_id,
-                    "channel_id": channel_id,
-                    "message_id": msg.id,
-                })
-            except Exception as e:
-                print(f"❌ Failed to send to {guild_id}/{channel_id}: {e}")
+            sends.append(channel.send(embed=embed))
+            targets.append((guild_id, channel_id))
 
-        await news.save()
+        results = await asyncio.gather(*sends, return_exceptions=True)
+        broadcast_entries: List[Dict[str, int]] = []
+        for (guild_id, channel_id), result in zip(targets, results):
+            if isinstance(result, BaseException):
+                logger.error("Failed to send to %s/%s: %s", guild_id, channel_id, result)
+                continue
+            broadcast_entries.append({
+                "guild_id": guild_id,
+                "channel_id": channel_id,
+                "message_id": result.id,
+            })
 
-        await interaction.response.send_message(
+        # Persist every posting with a single UPDATE
+        news.message_ids = [main_entry, *broadcast_entries]
+        await news.save(update_fields=["message_ids"])
+
+        await interaction.followup.send(
             "✅ News created and broadcasted to all subscribers!", ephemeral=True
         )
 
@@ -206,8 +265,10 @@ class NewsCommands(app_commands.Group):
             )
             return
 
-        is_reporter = (int(news.reporter) == interaction.user.id)
-        is_admin = (str(interaction.user.id) in ADMIN_ID)
+        # reporter is stored as the stringified user id, so compare as strings
+        uid_str = str(interaction.user.id)
+        is_reporter = (news.reporter == uid_str)
+        is_admin = (uid_str in get_news_config().admin_ids)
         if not (is_reporter or is_admin):
             await interaction.response.send_message(
                 "❌ You are not allowed to edit this item.", ephemeral=True
@@ -215,6 +276,7 @@ class NewsCommands(app_commands.Group):
             return
 
         # 2) Apply any provided changes to the model
+        old_payload = news.to_embed().to_dict()
         updated_fields = []
         if title is not None:
             news.title = title
@@ -247,11 +309,21 @@ class NewsCommands(app_commands.Group):
         # Save updated fields to the database
         await news.save(update_fields=updated_fields)
 
-        # 3) Build the new embed from updated values
+        # 3) Build the new embed from updated values; if nothing visible
+        # changed (e.g. only category/language) there's nothing to re-send
         new_embed = news.to_embed()
+        if new_embed.to_dict() == old_payload:
+            await interaction.response.send_message(
+                f"✅ Edited news `{news_id}`; the embed is unchanged so no messages were updated.",
+                ephemeral=True
+            )
+            return
 
-        # 4) Iterate over every recorded message_id and edit
+        # 4) Edit every recorded message concurrently; a PartialMessage
+        # issues the PATCH directly without fetching the message first
+        resolver = _ChannelResolver(interaction.client)
         failed = 0
+        edits: List[Coroutine[Any, Any, discord.Message]] = []
         for entry in news.message_ids or []:
             guild_id = entry.get("guild_id")
             channel_id = entry.get("channel_id")
@@ -260,22 +332,23 @@ class NewsCommands(app_commands.Group):
             if not (isinstance(guild_id, int) and isinstance(channel_id, int) and isinstance(message_id, int)):
                 continue
 
-            target_guild = interaction.client.get_guild(guild_id)
+            target_guild = resolver.guild(guild_id)
             if target_guild is None:
                 failed += 1
                 continue
 
-            target_channel = target_guild.get_channel(channel_id)
-            if not isinstance(target_channel, discord.TextChannel):
+            target_channel = resolver.channel(target_guild, channel_id)
+            if target_channel is None:
                 failed += 1
                 continue
 
-            try:
-                msg = await target_channel.fetch_message(message_id)
-                await msg.edit(embed=new_embed)
-            except (discord.NotFound, discord.Forbidden, discord.HTTPException):
+            edits.append(target_channel.get_partial_message(message_id).edit(embed=new_embed))
+
+        for result in await asyncio.gather(*edits, return_exceptions=True):
+            if isinstance(result, discord.HTTPException):
                 failed += 1
-                continue
+            elif isinstance(result, BaseException):
+                raise result
 
         # 5) Acknowledge outcome to the user
         success_count = len(news.message_ids or []) - failed
@@ -293,34 +366,41 @@ class NewsCommands(app_commands.Group):
             return
 
         # Allow deletion if reporter OR admin
-        is_reporter: bool = (int(news.reporter) == interaction.user.id)
-        is_admin: bool = (str(interaction.user.id) in ADMIN_ID)
+        uid_str = str(interaction.user.id)
+        is_reporter: bool = (news.reporter == uid_str)
+        is_admin: bool = (uid_str in get_news_config().admin_ids)
         if not (is_reporter or is_admin):
             await interaction.response.send_message(
                 "❌ You are not allowed to delete this", ephemeral=True
             )
             return
 
-        # Iterate through all saved message postings and delete them
+        # Group saved postings by channel so each channel gets bulk deletes
+        resolver = _ChannelResolver(interaction.client)
+        by_channel: Dict[int, Tuple[discord.TextChannel, List[int]]] = {}
         for entry in news.message_ids:  # type: ignore
             guild_id: int = entry.get("guild_id")
             channel_id: int = entry.get("channel_id")
             message_id: int = entry.get("message_id")
 
-            target_guild: Optional[discord.Guild] = interaction.client.get_guild(guild_id)
+            target_guild: Optional[discord.Guild] = resolver.guild(guild_id)
             if target_guild is None:
                 continue
 
-            target_channel = target_guild.get_channel(channel_id)
-            if not isinstance(target_channel, discord.TextChannel):
+            target_channel = resolver.channel(target_guild, channel_id)
+            if target_channel is None:
                 continue
 
-            try:
-                msg: discord.Message = await target_channel.fetch_message(message_id)
-                await msg.delete()
-            except (discord.NotFound, discord.Forbidden, discord.HTTPException):
-                continue
-            
+            by_channel.setdefault(channel_id, (target_channel, []))[1].append(message_id)
+
+        results = await asyncio.gather(
+            *(_delete_in_channel(channel, ids) for channel, ids in by_channel.values()),
+            return_exceptions=True,
+        )
+        for result in results:
+            if isinstance(result, BaseException) and not isinstance(result, discord.HTTPException):
+                raise result
+
         # Finally, delete the DB row
         await news.delete()
         await news.reset_sqlite_autoincrement("newsschema")
@@ -349,13 +429,13 @@ class NewsCommands(app_commands.Group):
             nation=nation or None,
             author=author or None,
             lang=language or None,
+            limit=5,
         )
         if not results:
             await interaction.followup.send("🔍 No matching news.", ephemeral=True)
             return
 
-        for n in results[:5]:
-            await interaction.followup.send(embed=n.to_embed(), ephemeral=True)
+        await _send_embeds(interaction, [n.to_embed() for n in results])
 
     @app_commands.command(name="recent", description="Show recent news in a language")
     @app_commands.describe(
@@ -368,14 +448,14 @@ class NewsCommands(app_commands.Group):
         language: str = "en",
         limit: int = 5,
     ) -> None:
+        await interaction.response.defer(ephemeral=True)
         limit = min(limit, 10)
         items: Sequence[NewsSchema] = await NewsSchema.get_recent_by_language(language, limit)
         if not items:
-            await interaction.response.send_message("No recent news found.", ephemeral=True)
+            await interaction.followup.send("No recent news found.", ephemeral=True)
             return
 
-        for n in items:
-            await interaction.response.send_message(embed=n.to_embed(), ephemeral=True)
+        await _send_embeds(interaction, [n.to_embed() for n in items])
 
 
 command = NewsCommands()
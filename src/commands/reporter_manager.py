@@ -1,9 +1,17 @@
 import discord
 from discord import app_commands
-import os
+from typing import Optional
+from tortoise.expressions import F
 from utils.db import ReporterSchema  # adjust to your module path
+from utils.config import get_reporter_role_id
+
+async def bump_strikes(user_id: int, delta: int) -> Optional[int]:
+    """Atomically add `delta` strikes; returns the new total, or None if no such reporter."""
+    updated = await ReporterSchema.filter(user_id=user_id).update(strikes=F("strikes") + delta)
+    if not updated:
+        return None
+    return await ReporterSchema.filter(user_id=user_id).first().values_list("strikes", flat=True)
 
-REQUIRED_ROLE_ID = int(str(os.environ.get("REPORTER_ROLE")))
 
 class ReporterManager(app_commands.Group):
     def __init__(self):
@@ -13,7 +21,7 @@ class ReporterManager(app_commands.Group):
     async def has_required_role(self, interaction: discord.Interaction) -> bool:
         member = interaction.user
         if isinstance(member, discord.Member):
-            return any(role.id == REQUIRED_ROLE_ID for role in member.roles)
+            return member.get_role(get_reporter_role_id()) is not None
         return False
 
     async def interaction_check(self, interaction: discord.Interaction) -> bool:
@@ -26,11 +34,7 @@ class ReporterManager(app_commands.Group):
 
     @app_commands.command(name="add", description="Add a reporter by user ID")
     async def add_reporter(self, interaction: discord.Interaction, user_id: str):
-        allowed = await self.interaction_check(interaction)
-        if not allowed: await interaction.response.send_message("You are not allowed to perform this action"); return
-        existing = await ReporterSchema.get_or_none(user_id=user_id)
-        
-        if existing:
+        if await ReporterSchema.filter(user_id=user_id).exists():
             await interaction.response.send_message("Reporter already exists.", ephemeral=True)
         else:
             await ReporterSchema.create(user_id=user_id)
@@ -38,69 +42,45 @@ class ReporterManager(app_commands.Group):
 
     @app_commands.command(name="remove", description="Remove a reporter by user ID")
     async def remove_reporter(self, interaction: discord.Interaction, user_id: int):
-        allowed = await self.interaction_check(interaction)
-        if not allowed: await interaction.response.send_message("You are not allowed to perform this action"); return
-        rep = await ReporterSchema.get_or_none(user_id=user_id)
-        if rep:
-            await rep.delete()
+        if await ReporterSchema.filter(user_id=user_id).delete():
             await interaction.response.send_message(f"Reporter `{user_id}` removed.", ephemeral=True)
         else:
             await interaction.response.send_message("Reporter not found.", ephemeral=True)
 
     @app_commands.command(name="suspend", description="Suspend a reporter by user ID")
     async def suspend_reporter(self, interaction: discord.Interaction, user_id: int):
-        rep = await ReporterSchema.get_or_none(user_id=user_id)
-        allowed = await self.interaction_check(interaction)
-        if not allowed: await interaction.response.send_message("You are not allowed to perform this action"); return
-        if rep:
-            rep.suspended = True
-            await rep.save()
+        if await ReporterSchema.filter(user_id=user_id).update(suspended=True):
             await interaction.response.send_message(f"Reporter `{user_id}` suspended.", ephemeral=True)
         else:
             await interaction.response.send_message("Reporter not found.", ephemeral=True)
 
     @app_commands.command(name="unsuspend", description="Unsuspend a reporter by user ID")
     async def unsuspend_reporter(self, interaction: discord.Interaction, user_id: int):
-        rep = await ReporterSchema.get_or_none(user_id=user_id)
-        allowed = await self.interaction_check(interaction)
-        if not allowed: await interaction.response.send_message("You are not allowed to perform this action"); return
-        if rep:
-            rep.suspended = False
-            await rep.save()
+        if await ReporterSchema.filter(user_id=user_id).update(suspended=False):
             await interaction.response.send_message(f"Reporter `{user_id}` unsuspended.", ephemeral=True)
         else:
             await interaction.response.send_message("Reporter not found.", ephemeral=True)
 
     @app_commands.command(name="strikes", description="Get the number of strikes for a reporter by user ID")
     async def get_strikes(self, interaction: discord.Interaction, user_id: int):
-        rep = await ReporterSchema.get_or_none(user_id=user_id)
-        if rep:
-            rep.strikes += 1
-            await rep.save()
-            await interaction.response.send_message(f"Strike added to reporter `{user_id}`. Total strikes: {rep.strikes}", ephemeral=True)
+        strikes = await ReporterSchema.filter(user_id=user_id).first().values_list("strikes", flat=True)
+        if strikes is not None:
+            await interaction.response.send_message(f"Reporter `{user_id}` has {strikes} strikes.", ephemeral=True)
         else:
             await interaction.response.send_message("Reporter not found.", ephemeral=True)
             
     async def add_strike(self, interaction: discord.Interaction, user_id: int):
         """Add a strike to a reporter."""
-        allowed = await self.interaction_check(interaction)
-        if not allowed: await interaction.response.send_message("You are not allowed to perform this action"); return
-        rep = await ReporterSchema.get_or_none(user_id=user_id)
-        if rep:
-            rep.strikes += 1
-            await rep.save()
-            await interaction.response.send_message(f"Strike added to reporter `{user_id}`. Total strikes: {rep.strikes}", ephemeral=True)
+        strikes = await bump_strikes(user_id, 1)
+        if strikes is not None:
+            await interaction.response.send_message(f"Strike added to reporter `{user_id}`. Total strikes: {strikes}", ephemeral=True)
         else:
             await interaction.response.send_message("Reporter not found.", ephemeral=True)
 
     async def remove_strike(self, interaction: discord.Interaction, user_id: int):
-        allowed = await self.interaction_check(interaction)
-        if not allowed: await interaction.response.send_message("You are not allowed to perform this action"); return
-        rep = await ReporterSchema.get_or_none(user_id=user_id)
-        if rep:
-            rep.strikes -= 1
-            await rep.save()
-            await interaction.response.send_message(f"Strike removed from reporter `{user_id}`. Total strikes: {rep.strikes}", ephemeral=True)
+        strikes = await bump_strikes(user_id, -1)
+        if strikes is not None:
+            await interaction.response.send_message(f"Strike removed from reporter `{user_id}`. Total strikes: {strikes}", ephemeral=True)
         else:
             await interaction.response.send_message("Reporter not found.", ephemeral=True)
             
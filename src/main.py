@@ -20,51 +20,39 @@ from tortoise import Tortoise
 import discord
 from discord.ext import commands
 import uvicorn
-import importlib
-import pkgutil
 from discord import app_commands
-import dotenv, os, asyncio, threading
-from utils.db import ReporterSchema
+import dotenv, os, asyncio, logging, queue
+from logging.handlers import QueueHandler, QueueListener
+try:
+    import uvloop
+except ImportError:  # optional, falls back to the stdlib loop
+    uvloop = None
+from utils.db import NewsSchema, ReporterSchema
+from utils.config import get_token, validate_config
 dotenv.load_dotenv()
 from utils.globals import *
+from commands import COMMANDS
 
-def load_app_command_modules(tree: app_commands.CommandTree, package: str):
+def load_app_command_modules(tree: app_commands.CommandTree):
     """
-    Recursively scan `package` (e.g. "commands") for any sub-modules,
-    import them, look for a `command` export, and register it if valid.
+    Register every command listed in `commands.COMMANDS` on the tree.
     """
-    pkg = importlib.import_module(package)
-
-    for _finder, module_name, _is_pkg in pkgutil.walk_packages(pkg.__path__, prefix=package + "."):
-        print(f"[LOAD] Trying module {module_name}")
-        try:
-            module = importlib.import_module(module_name)
-        except Exception as e:
-            print(f"[ERROR] Failed to import {module_name}: {e}")
+    seen = set()
+    for cmd in COMMANDS:
+        if cmd.name in seen:
+            print(f"[SKIP] `{cmd.name}` is already registered")
             continue
+        seen.add(cmd.name)
+        tree.add_command(cmd)
+        print(f"[OK] Registered `{cmd.name}`")
 
-        cmd = getattr(module, "command", None)
-        if cmd is None:
-            print(f"[SKIP] No `command` export in {module_name}")
-            continue
-
-        if not isinstance(cmd, (app_commands.Command, app_commands.Group)):
-            print(f"[SKIP] `command` in {module_name} is not a Command or Group")
-            continue
-
-        # Try to add it
-        try:
-            tree.add_command(cmd)
-            print(f"[OK] Registered `{cmd.name}` from {module_name}")
-        except Exception as e:
-            print(f"[ERROR] Could not register `{cmd.name}` from {module_name}: {e}")
 
+# set once the reporter backfill has run; on_ready fires again on every reconnect
+reporters_synced = asyncio.Event()
+async def setup():
+    if reporters_synced.is_set(): return
+    reporters_synced.set()
 
-seted_up = False
-async def setup(seted_up: bool):
-    if seted_up: return
-    seted_up = True
-     
     reporter_role = 1376639373721866240
     
     guild = bot.get_guild(1376636845965705226)
@@ -72,39 +60,87 @@ async def setup(seted_up: bool):
     role = guild.get_role(reporter_role)
     if not role: return
     members = role.members
-    for member in members:
-        user_id = member.id
-        existing = await ReporterSchema.get_or_none(user_id=user_id)
-        if not existing:
-            await ReporterSchema.create(user_id=user_id)
+    existing = set(await ReporterSchema.filter(
+        user_id__in=[m.id for m in members]
+    ).values_list("user_id", flat=True))
+    to_create = [ReporterSchema(user_id=m.id) for m in members if m.id not in existing]
+    if to_create:
+        await ReporterSchema.bulk_create(to_create, ignore_conflicts=True)
 
 
-def start_api():
+def setup_logging() -> QueueListener:
+    """
+    Route all log records through a queue so emitting one never blocks the
+    event loop; a background listener thread does the actual stream writes.
+    """
+    log_queue: queue.SimpleQueue[logging.LogRecord] = queue.SimpleQueue()
+    handler = logging.StreamHandler()
+    handler.setFormatter(logging.Formatter("%(asctime)s [%(levelname)s] %(name)s: %(message)s"))
+    listener = QueueListener(log_queue, handler)
+
+    root = logging.getLogger()
+    root.setLevel(logging.INFO)
+    root.addHandler(QueueHandler(log_queue))
+    listener.start()
+    return listener
 
-    uvicorn.run("utils.api:router", host="0.0.0.0", port=3000)  # No reload
 
 async def start_db():
-    await Tortoise.init(
-        db_url="sqlite://db.db",
-        modules={"models": ["utils.db"]},
-    )
+    # Extra sqlite credentials are applied as PRAGMAs when the connection opens
+    await Tortoise.init(config={
+        "connections": {
+            "default": {
+                "engine": "tortoise.backends.sqlite",
+                "credentials": {
+                    "file_path": "db.db",
+                    "journal_mode": "WAL",
+                    "synchronous": "NORMAL",
+                    "temp_store": "MEMORY",
+                    "mmap_size": 268435456,
+                },
+            },
+        },
+        "apps": {
+            "models": {"models": ["utils.db"], "default_connection": "default"},
+        },
+    })
     await Tortoise.generate_schemas()
+    await NewsSchema.setup_fts()
     print("Schema generated!")
 
+async def setup_hook():
+    # Runs once per process, unlike on_ready
+    load_app_command_modules(bot.tree)
+    # Syncing is a rate limited global API call, only do it when deploying command changes
+    if os.environ.get("SYNC_COMMANDS"):
+        await bot.tree.sync()
+        print("Commands synced")
+
+bot.setup_hook = setup_hook
+
 @bot.event
 async def on_ready():
-  
-
     print(f"Logged in as {bot.user} ({bot.user.id})")
-
-    load_app_command_modules(bot.tree, "commands")
-    await bot.tree.sync()
-    print("Commands synced")
-    await setup(seted_up)
+    await setup()
 
     
+async def main():
+    """Run the API server and the bot on one event loop so they share the DB connection."""
+    validate_config()
+    await start_db()
+    config = uvicorn.Config("utils.api:app", host="0.0.0.0", port=3000, loop="asyncio")
+    server = uvicorn.Server(config)
+    api_task = asyncio.create_task(server.serve())
+    try:
+        await bot.start(get_token())
+    finally:
+        server.should_exit = True
+        await api_task
+
+
 if __name__ == "__main__":
-    asyncio.run(start_db())
-    api_thread = threading.Thread(target=start_api, daemon=True)
-    api_thread.start()
-    #bot.run(str(os.environ.get("TOKEN")))
+    setup_logging()
+    if uvloop is not None:
+        uvloop.run(main())
+    else:
+        asyncio.run(main())
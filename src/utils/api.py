@@ -4,10 +4,18 @@
 # Updated FastAPI routes with reverse index integration
 #
 
-from fastapi import APIRouter, Query, HTTPException
-from typing import Optional
-from .db import NewsSchema, Category
-from fastapi.responses import FileResponse, HTMLResponse
+from fastapi import APIRouter, FastAPI, Query, HTTPException
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+from .db import NewsSchema, Category, Languages
+from fastapi.responses import FileResponse, HTMLResponse, JSONResponse, ORJSONResponse, Response
+try:
+    import orjson  # noqa: F401
+    _JSON_RESPONSE = ORJSONResponse
+except ImportError:  # optional, same fallback as db.py
+    _JSON_RESPONSE = JSONResponse
+from fastapi.staticfiles import StaticFiles
+from starlette.middleware.gzip import GZipMiddleware
+from tortoise.signals import post_delete, post_save
 from .globals import bot
 from .reverse_lookup import (
     initialize_search_index, 
@@ -15,11 +23,72 @@ from .reverse_lookup import (
     add_news_to_index, 
     news_index
 )
-import os, logging
+import asyncio, os, logging, time
+from datetime import datetime, timezone
 
 logger = logging.getLogger(__name__)
 
-router = APIRouter(prefix="", tags=["News"])
+router = APIRouter(prefix="", tags=["News"], default_response_class=_JSON_RESPONSE)
+
+STATIC_DIR = os.path.join("src", "static")
+_INDEX_PATH = os.path.join(STATIC_DIR, "index.html")
+_LOGO_PATH = os.path.join(STATIC_DIR, "favicon.ico")
+_STATIC_HEADERS = {"Cache-Control": "public, max-age=3600"}
+
+# cache for the read-only /api routes, a hit skips the db and discord entirely.
+# cleared whenever a news row is saved or deleted, the ttl only bounds staleness
+# of things we can't observe like usernames
+_RESPONSE_CACHE_TTL = 60.0
+_RESPONSE_CACHE_MAX = 256
+_response_cache: Dict[Tuple[Any, ...], Tuple[float, Any]] = {}
+_inflight: Dict[Tuple[Any, ...], "asyncio.Future[Any]"] = {}
+_cache_generation = 0
+
+# Category is a static enum so the body is encoded once and shared by every response
+_CATEGORIES_BODY = _JSON_RESPONSE({"categories": [key.value for key in Category]}).body
+
+
+async def _fill(key: Tuple[Any, ...], build: Callable[[], Awaitable[Any]]) -> Any:
+    generation = _cache_generation
+    value = await build()
+    if generation != _cache_generation:
+        # news changed while we were building, don't store a stale result
+        return value
+    _response_cache.pop(key, None)
+    if len(_response_cache) >= _RESPONSE_CACHE_MAX:
+        # dicts keep insertion order, so the first key is the oldest entry
+        _response_cache.pop(next(iter(_response_cache)))
+    _response_cache[key] = (time.monotonic() + _RESPONSE_CACHE_TTL, value)
+    return value
+
+
+async def _cached(key: Tuple[Any, ...], build: Callable[[], Awaitable[Any]]) -> Any:
+    hit = _response_cache.get(key)
+    if hit is not None and hit[0] > time.monotonic():
+        return hit[1]
+    # concurrent misses for the same key share one build instead of each hitting the db
+    task = _inflight.get(key)
+    if task is None:
+        task = asyncio.ensure_future(_fill(key, build))
+        _inflight[key] = task
+        # only drop our own entry, an invalidation may already have replaced it
+        task.add_done_callback(lambda t: _inflight.get(key) is t and _inflight.pop(key))
+    # shield so one cancelled request doesn't cancel the build for the others
+    return await asyncio.shield(task)
+
+def _invalidate_responses() -> None:
+    global _cache_generation
+    _cache_generation += 1
+    _response_cache.clear()
+    _inflight.clear()
+
+@post_save(NewsSchema)
+async def _news_saved(*_args, **_kwargs) -> None:
+    _invalidate_responses()
+
+@post_delete(NewsSchema)
+async def _news_deleted(*_args, **_kwargs) -> None:
+    _invalidate_responses()
 
 @router.on_event("startup")
 async def startup_event():
@@ -31,35 +100,67 @@ async def startup_event():
 
 @router.get("/api/get/{title}")
 async def get_news_by_title(title: str, q: Optional[str] = None):
+    return await _cached(("title", title, q), lambda: _get_news_by_title(title, q))
+
+async def _get_news_by_title(title: str, q: Optional[str]):
     try:
         candidate_ids = await search_news_fast(title, limit=20)
         
         if candidate_ids:
-            news_items = await NewsSchema.filter(id__in=candidate_ids).all()
-            id_to_item = {item.id: item for item in news_items}
-            ordered_items = [id_to_item[news_id] for news_id in candidate_ids if news_id in id_to_item]
+            ordered_items = await NewsSchema.fetch_ordered(candidate_ids)
         else:
             ordered_items = await NewsSchema.search(topic=title)
         
         return {
-            "news": [await item.to_dict(bot) for item in ordered_items], 
+            "news": await NewsSchema.to_dicts(ordered_items, bot), 
             "q": q,
             "indexed": news_index.is_initialized
         }
     except Exception as e:
         logger.error(f"Error in get_news_by_title: {e}")
         news_items = await NewsSchema.search(topic=title)
-        return {"news": [await item.to_dict(bot) for item in news_items], "q": q}
+        return {"news": await NewsSchema.to_dicts(news_items, bot), "q": q}
+
+def _format_cursor(date: datetime) -> str:
+    # UTC with a "Z" suffix: a "+00:00" offset turns into a space when the
+    # header value is pasted into a query string without url-encoding
+    if date.tzinfo is None:
+        date = date.replace(tzinfo=timezone.utc)
+    else:
+        date = date.astimezone(timezone.utc)
+    return date.isoformat().replace("+00:00", "Z")
 
 @router.get("/api/filter-by-language/{lang}")
-async def get_by_language(lang: str):
-    news_items = await NewsSchema.filter_by_language(lang.upper())
-    return [await item.to_dict(bot) for item in news_items]
+async def get_by_language(
+    response: Response,
+    lang: Languages,
+    cursor: Optional[datetime] = Query(None, description="date of the last item of the previous page"),
+    limit: int = Query(50, ge=1, le=200)
+):
+    # the FastAPI app (see `app` below) answers anything outside the enum with a 422
+    # before we touch the db
+    lang = lang.value
+
+    async def build():
+        news_items = await NewsSchema.filter_by_language(lang, before=cursor, limit=limit)
+        # the "date" field is rounded to seconds, so hand out the exact one as the cursor
+        next_cursor = _format_cursor(news_items[-1].date) if len(news_items) == limit else None
+        return await NewsSchema.to_dicts(news_items, bot), next_cursor
+
+    items, next_cursor = await _cached(("language", lang, cursor, limit), build)
+    if next_cursor is not None:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return items
 
 @router.get("/api/recent/{lang}")
-async def get_recent(lang: str, limit: int = 10):
-    news_items = await NewsSchema.get_recent_by_language(lang.upper(), limit)
-    return [await item.to_dict(bot) for item in news_items]
+async def get_recent(lang: Languages, limit: int = 10):
+    lang = lang.value
+
+    async def build():
+        news_items = await NewsSchema.get_recent_by_language(lang, limit)
+        return await NewsSchema.to_dicts(news_items, bot)
+
+    return await _cached(("recent", lang, limit), build)
 
 @router.get("/api/search")
 async def search_news(
@@ -67,44 +168,53 @@ async def search_news(
     nation: Optional[str] = Query(None),
     author: Optional[str] = Query(None),
     lang: Optional[str] = Query(None)
+):
+    return await _cached(
+        ("search", topic, nation, author, lang),
+        lambda: _search_news(topic, nation, author, lang),
+    )
+
+async def _search_news(
+    topic: Optional[str],
+    nation: Optional[str],
+    author: Optional[str],
+    lang: Optional[str]
 ):
     if topic and not any([nation, author, lang]):
         try:
             candidate_ids = await search_news_fast(topic, limit=20)
             if candidate_ids:
-                news_items = await NewsSchema.filter(id__in=candidate_ids).all()
-                id_to_item = {item.id: item for item in news_items}
-                ordered_items = [id_to_item[news_id] for news_id in candidate_ids if news_id in id_to_item]
-                return [await item.to_dict(bot) for item in ordered_items]
+                ordered_items = await NewsSchema.fetch_ordered(candidate_ids)
+                return await NewsSchema.to_dicts(ordered_items, bot)
         except Exception as e:
             logger.error(f"Index search failed, falling back to database: {e}")
     
     
     news_items = await NewsSchema.search(topic=topic, nation=nation, author=author, lang=lang)
-    return [await item.to_dict(bot) for item in news_items]
+    return await NewsSchema.to_dicts(news_items, bot)
 
 @router.get('/api/search/all/{query}')
 async def search_all_news(query: str, limit: int = 10):
+    return await _cached(("search_all", query, limit), lambda: _search_all_news(query, limit))
+
+async def _search_all_news(query: str, limit: int):
     try:
         if news_index.is_initialized:
             candidate_ids = await search_news_fast(query, limit=limit)
             
             if candidate_ids:
-                news_items = await NewsSchema.filter(id__in=candidate_ids).all()
-                
-                id_to_item = {item.id: item for item in news_items}
-                ordered_items = [id_to_item[news_id] for news_id in candidate_ids if news_id in id_to_item]
+                ordered_items = await NewsSchema.fetch_ordered(candidate_ids)
                 
-                return [await item.to_dict(bot) for item in ordered_items]
+                return await NewsSchema.to_dicts(ordered_items, bot)
         
         logger.warning("Using fallback search - index not available")
-        news_items = await NewsSchema.search_all(query.upper(), limit)
-        return [await item.to_dict(bot) for item in news_items]
+        news_items = await NewsSchema.search_all(query, limit)
+        return await NewsSchema.to_dicts(news_items, bot)
         
     except Exception as e:
         logger.error(f"Error in search_all_news: {e}")
-        news_items = await NewsSchema.search_all(query.upper(), limit)
-        return [await item.to_dict(bot) for item in news_items]
+        news_items = await NewsSchema.search_all(query, limit)
+        return await NewsSchema.to_dicts(news_items, bot)
 
 @router.get("/api/search/stats")
 async def get_search_stats():
@@ -117,31 +227,21 @@ async def get_search_stats():
 
 @router.get("/", response_class=HTMLResponse)
 async def homepage():
-    file_path = os.path.join("src", "static", "index.html")
-    return FileResponse(file_path, media_type="text/html")
-
-@router.get("/assets/{filename}")
-async def serve_asset(filename: str):
-    file_path = os.path.join("src", "static", "assets", filename)
-    if not os.path.exists(file_path):
-        raise HTTPException(status_code=404, detail="Not found")
-    
-    if filename.endswith(".css"):
-        return FileResponse(file_path, media_type="text/css")
-    elif filename.endswith(".js"):
-        return FileResponse(file_path, media_type="application/javascript")
-    else:
-        return FileResponse(file_path)
+    return FileResponse(_INDEX_PATH, media_type="text/html", headers=_STATIC_HEADERS)
 
 @router.get("/logo")
 async def get_logo():
-    file_path = os.path.join("src", "static", "favicon.ico")
-    return FileResponse(file_path, media_type="image/jpeg")
+    return FileResponse(_LOGO_PATH, media_type="image/jpeg", headers=_STATIC_HEADERS)
 
 @router.get("/api/categories")
 async def categories():
-    l = []
-    for key in Category:
-        l.append(key.value)
-    return {"categories": l}
+    return Response(_CATEGORIES_BODY, media_type="application/json")
+
 
+# the app gives us FastAPI's validation/exception handlers (422s instead of 500s)
+app = FastAPI()
+app.include_router(router)
+app.add_middleware(GZipMiddleware, minimum_size=1024)
+# bundled css/js, StaticFiles guesses the media type and handles etags itself.
+# mounted on the app since include_router doesn't carry mounts over
+app.mount("/assets", StaticFiles(directory=os.path.join(STATIC_DIR, "assets")), name="assets")
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2025 charis_k
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/gpl-3.0.html>.
+
+from __future__ import annotations
+from dataclasses import dataclass
+import functools
+import os
+from typing import Optional
+
+import discord
+
+
+@dataclass(frozen=True, slots=True)
+class NewsConfig:
+    guild_id: int
+    news_channel_id: int
+    admin_ids: frozenset[str]
+    guild_obj: discord.Object
+
+
+@functools.lru_cache(maxsize=1)
+def get_news_config() -> NewsConfig:
+    """Parse the news related environment variables once per process."""
+    guild_id = int(os.environ["GUILD_ID"])
+    return NewsConfig(
+        guild_id=guild_id,
+        news_channel_id=int(os.environ["NEWS_CHANNEL_ID"]),
+        admin_ids=frozenset(
+            s.strip()
+            for s in os.environ.get("ADMIN_ID", "").split(",")
+            if s.strip()
+        ),
+        guild_obj=discord.Object(id=guild_id),
+    )
+
+
+@functools.lru_cache(maxsize=1)
+def get_reporter_role_id() -> int:
+    """Role required for the /reporter commands."""
+    return int(os.environ["REPORTER_ROLE"])
+
+
+@functools.lru_cache(maxsize=1)
+def get_token() -> str:
+    token = os.environ.get("TOKEN")
+    if not token:
+        raise RuntimeError("TOKEN is not set")
+    return token
+
+
+@functools.lru_cache(maxsize=1)
+def get_logo_url() -> Optional[str]:
+    """Thumbnail used on every news embed."""
+    return os.environ.get("LOGO_URL")
+
+
+def validate_config() -> None:
+    """Parse every required variable up front so a bad .env fails at startup, not on first use."""
+    get_news_config()
+    get_reporter_role_id()
+    get_token()
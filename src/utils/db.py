@@ -19,19 +19,72 @@
 # TODO: use aerich to make auto updating db schemas
 
 from __future__ import annotations
-from typing import Dict, List, Optional, Any, Type, Sequence
+from typing import Callable, Dict, List, Optional, Any, Type, Sequence, Tuple
 from tortoise import fields, models
 from tortoise.exceptions import DoesNotExist
 from tortoise.fields.relational import ForeignKeyNullableRelation
 from tortoise.expressions import Q
 from tortoise import Tortoise
-import discord, os
+import discord, os, time, asyncio, heapq, logging
 from discord.ext import commands
 from datetime import datetime, timezone
 from enum import Enum
-import difflib
 from difflib import SequenceMatcher
 from .reverse_lookup import *
+from .config import get_logo_url
+
+logger = logging.getLogger(__name__)
+
+try:
+    import orjson
+
+    def _json_dumps(value: Any) -> str:
+        return orjson.dumps(value).decode()
+
+    _json_loads = orjson.loads
+except ImportError:
+    import json
+
+    def _json_dumps(value: Any) -> str:
+        return json.dumps(value, separators=(",", ":"))
+
+    _json_loads = json.loads
+
+try:
+    from rapidfuzz.fuzz import ratio as _fuzz_ratio
+
+    def _similarity(a: str, b: str) -> float:
+        return _fuzz_ratio(a, b) / 100.0
+
+    def _similarity_to(term: str) -> Callable[[str], float]:
+        return lambda text: _fuzz_ratio(term, text) / 100.0
+
+    def _similarity_many(term: str, texts: List[str]) -> List[float]:
+        try:
+            from rapidfuzz.process import cdist
+            # one native call over the whole column, spread across cores
+            return [score / 100.0 for score in cdist([term], texts, scorer=_fuzz_ratio, workers=-1)[0]]
+        except ImportError:  # cdist needs numpy
+            return [_fuzz_ratio(term, text) / 100.0 for text in texts]
+except ImportError:
+    def _similarity(a: str, b: str) -> float:
+        return SequenceMatcher(None, a, b).ratio()
+
+    def _similarity_to(term: str) -> Callable[[str], float]:
+        # SequenceMatcher indexes seq2, so keep the fixed term there and only swap seq1
+        matcher = SequenceMatcher(None, autojunk=False)
+        matcher.set_seq2(term)
+
+        def score(text: str) -> float:
+            matcher.set_seq1(text)
+            return matcher.ratio()
+        return score
+
+    def _similarity_many(term: str, texts: List[str]) -> List[float]:
+        score = _similarity_to(term)
+        return [score(text) for text in texts]
+
+_BLURPLE = discord.Colour.blurple()
 
 class Region(Enum):
     North_America   = "North America"
@@ -63,6 +116,100 @@ class Languages(Enum):
     TURK = "TURK"
     CHINESE = "CHINESE"
 
+
+def _rank_candidates(term_lower: str, candidates: Sequence[Tuple[int, str, str, str]], limit: int) -> List[int]:
+    """
+    Fuzzy-score (id, title, description, category) rows against `term_lower` and
+    return the ids of the best `limit`, best first. Plain data in and out so it
+    can run off the event loop.
+    """
+    if limit <= 0:
+        return []
+    # min-heap of the best `limit` (score, -position, id) seen so far; -position
+    # makes earlier rows win ties, same as the stable sort this replaced
+    top: list[tuple[float, int, int]] = []
+    similarity = _similarity_to(term_lower)
+
+    # titles and categories are short, score those columns in one batch up front
+    titles = [row[1].lower() for row in candidates]
+    cats = [row[3].lower() for row in candidates]
+    title_ratios = _similarity_many(term_lower, titles)
+    cat_ratios = _similarity_many(term_lower, cats)
+
+    for position, (news_id, _title, description, _category) in enumerate(candidates):
+        title_text = titles[position]
+        desc_text = description.lower()
+        cat_text = cats[position]
+
+        bonus = 0.0
+        if term_lower in title_text:
+            bonus += 0.10
+        if term_lower in desc_text:
+            bonus += 0.05
+        if term_lower in cat_text:
+            bonus += 0.03
+
+        # a row has to beat the threshold, or the worst kept row once we have `limit`
+        cutoff = top[0][0] if len(top) >= limit else 0.10
+
+        title_ratio = title_ratios[position]
+        cat_ratio  = cat_ratios[position]
+        # the description is the long, expensive one, skip it when even a
+        # perfect match there couldn't get this row over the cutoff
+        if 0.50 * title_ratio + 0.30 + 0.20 * cat_ratio + bonus <= cutoff:
+            continue
+        desc_ratio = similarity(desc_text)
+
+        combined_score = (
+            0.50 * title_ratio +
+            0.30 * desc_ratio +
+            0.20 * cat_ratio +
+            bonus
+        )
+
+        if combined_score <= cutoff:
+            continue
+        if len(top) >= limit:
+            heapq.heapreplace(top, (combined_score, -position, news_id))
+        else:
+            heapq.heappush(top, (combined_score, -position, news_id))
+
+    top.sort(reverse=True)
+    return [news_id for (_score, _pos, news_id) in top]
+
+
+# composite indexes on NewsSchema, also created at startup for databases made before them
+_NEWS_INDEXES = (("language", "date"), ("category", "date"))
+
+# set by NewsSchema.setup_fts, whether news_fts exists and whether it uses the trigram tokenizer
+_fts_enabled = False
+_fts_trigram = False
+
+# fetch_user results, so API reads don't go back to Discord for the same reporters
+_USER_CACHE_TTL = 3600.0
+_USER_MISS_TTL = 300.0
+_USER_CACHE_MAX = 4096
+_user_cache: Dict[int, Tuple[float, Optional[discord.User]]] = {}
+_user_inflight: Dict[int, "asyncio.Future[discord.User]"] = {}
+
+
+def _fetch_user(bot: commands.Bot, uid: int) -> "asyncio.Future[discord.User]":
+    # concurrent requests for the same uncached user share one REST call
+    task = _user_inflight.get(uid)
+    if task is None:
+        task = asyncio.ensure_future(bot.fetch_user(uid))
+        _user_inflight[uid] = task
+        task.add_done_callback(lambda _: _user_inflight.pop(uid, None))
+    return task
+
+
+def _cache_user(uid: int, user: Optional[discord.User], ttl: float) -> None:
+    _user_cache.pop(uid, None)
+    if len(_user_cache) >= _USER_CACHE_MAX:
+        _user_cache.pop(next(iter(_user_cache)))
+    _user_cache[uid] = (time.monotonic() + ttl, user)
+
+
 class ReporterSchema(models.Model):
     id        = fields.IntField(pk=True)
     user_id   = fields.BigIntField(unique=True)
@@ -96,22 +243,28 @@ class NewsSchema(models.Model):
     category      = fields.TextField()
     date          = fields.DatetimeField(auto_now_add=False, auto_now=True)
     # Replace single `message_id` field with a JSON list of all postings
-    message_ids   = fields.JSONField(default=list)
+    message_ids   = fields.JSONField(default=list, encoder=_json_dumps, decoder=_json_loads)
 
     editor: ForeignKeyNullableRelation[ReporterSchema] = fields.ForeignKeyField(
         "models.ReporterSchema", related_name="news_items", on_delete=fields.SET_NULL, null=True
     )
 
+    class Meta:
+        # spelled out because the fts5 index and triggers refer to it by name
+        table = "newsschema"
+        # `WHERE language|category = ? ORDER BY date DESC LIMIT ?` walks these instead of sorting
+        indexes = _NEWS_INDEXES
+
 
 
     def to_embed(self) -> discord.Embed:
         embed = discord.Embed(
             title=self.title,
             description=self.description,
-            color=discord.Color.blurple()
+            color=_BLURPLE
         )
 
-        embed.set_thumbnail(url=os.environ.get("LOGO_URL"))
+        embed.set_thumbnail(url=get_logo_url())
         embed.set_image(url=self.image_url)
 
         reporter = f"<@{self.reporter}>" if self.reporter else "Unknown"
@@ -126,61 +279,75 @@ class NewsSchema(models.Model):
         return embed
 
     def is_similar_to(self, other: "NewsSchema", threshold: float = 0.85) -> bool:
-        title_ratio = difflib.SequenceMatcher(
-            None, self.title.lower(), other.title.lower()
-        ).ratio()
-        desc_ratio  = difflib.SequenceMatcher(
-            None, self.description.lower(), other.description.lower()
-        ).ratio()
+        title_ratio = _similarity(self.title.lower(), other.title.lower())
+        desc_ratio  = _similarity(self.description.lower(), other.description.lower())
         return title_ratio > threshold and desc_ratio > threshold
         
-    async def to_dict(self, bot: commands.Bot) -> dict[str, int | str | None]:
-        if not bot or not hasattr(bot, 'fetch_user') or not bot.is_ready():
-            return {
-                "id": self.id,
-                "title": self.title,
-                "description": self.description,
-                "image_url": self.image_url,
-                "credit": f"User:{self.credit}",
-                "reporter": f"User:{self.reporter}",
-                "language": self.language,
-                "region": self.region.value if self.region else "global",
-                "date": self.date.strftime("%Y-%m-%d %H:%M:%S UTC") if self.date else None,
-                "category": self.category
-            }
-        
-        credit_username = f"User:{self.credit}"  
+    @staticmethod
+    def _user_label(raw: Optional[str], users: Optional[Dict[int, discord.User]]) -> str:
+        if users is None or not raw:
+            return f"User:{raw}"
         try:
-            if self.credit:
-                credit_user = await bot.fetch_user(int(self.credit))
-                credit_username = credit_user.name
-        except (discord.NotFound, discord.HTTPException, ValueError) as e:
-            print(f"Could not fetch credit user {self.credit}: {e}")
-            credit_username = f"Unknown:{self.credit}"
-        except Exception as e:
-            print(f"Unexpected error fetching credit user: {e}")
+            user = users.get(int(raw))
+        except ValueError:
+            user = None
+        return user.name if user is not None else f"Unknown:{raw}"
 
-        reporter_username = f"User:{self.reporter}"  
-        try:
-            if self.reporter:
-                reporter_user = bot.get_user(int(self.reporter))
-                if reporter_user is None:
-                    reporter_user = await bot.fetch_user(int(self.reporter))
-                reporter_username = reporter_user.name
-        except (discord.NotFound, discord.HTTPException, ValueError) as e:
-            print(f"Could not fetch reporter user {self.reporter}: {e}")
-            reporter_username = f"Unknown:{self.reporter}"
-        except Exception as e:
-            print(f"Unexpected error fetching reporter user: {e}")
+    @classmethod
+    async def resolve_users(
+        cls, bot: commands.Bot, items: Sequence["NewsSchema"]
+    ) -> Optional[Dict[int, discord.User]]:
+        """
+        Look up every credit/reporter in `items` at once, cache first and then one
+        parallel batch of fetch_user for the rest. None if the bot can't be used yet.
+        """
+        if not bot or not hasattr(bot, 'fetch_user') or not bot.is_ready():
+            return None
 
+        ids = set()
+        for item in items:
+            for raw in (item.credit, item.reporter):
+                if raw and str(raw).isdecimal():
+                    ids.add(int(raw))
+
+        now = time.monotonic()
+        users: Dict[int, discord.User] = {}
+        missing = []
+        for uid in ids:
+            cached = _user_cache.get(uid)
+            if cached is not None and cached[0] > now:
+                if cached[1] is not None:
+                    users[uid] = cached[1]
+                continue
+            user = bot.get_user(uid)
+            if user is None:
+                missing.append(uid)
+            else:
+                users[uid] = user
+
+        fetched = await asyncio.gather(
+            *(asyncio.shield(_fetch_user(bot, uid)) for uid in missing), return_exceptions=True
+        )
+        for uid, result in zip(missing, fetched):
+            if isinstance(result, BaseException):
+                print(f"Could not fetch user {uid}: {result}")
+                # remember deleted accounts for a bit, transient errors get retried next time
+                if isinstance(result, discord.NotFound):
+                    _cache_user(uid, None, _USER_MISS_TTL)
+            else:
+                users[uid] = result
+                _cache_user(uid, result, _USER_CACHE_TTL)
+        return users
+
+    def _to_dict(self, users: Optional[Dict[int, discord.User]]) -> dict[str, int | str | None]:
         # Handle date formatting
         formatted_date = None
         if self.date:
             try:
                 if self.date.tzinfo is None:
-                    date_utc = self.date.replace(tzinfo=discord.utils.utcnow().tzinfo)
+                    date_utc = self.date.replace(tzinfo=timezone.utc)
                 else:
-                    date_utc = self.date.astimezone(discord.utils.utcnow().tzinfo)
+                    date_utc = self.date.astimezone(timezone.utc)
                 formatted_date = date_utc.strftime("%Y-%m-%d %H:%M:%S UTC")
             except Exception as e:
                 print(f"Error formatting date: {e}")
@@ -191,22 +358,42 @@ class NewsSchema(models.Model):
             "title": self.title,
             "description": self.description,
             "image_url": self.image_url,
-            "credit": credit_username,
-            "reporter": reporter_username,
+            "credit": self._user_label(self.credit, users),
+            "reporter": self._user_label(self.reporter, users),
             "language": self.language,
             "region": self.region.value if self.region else "global",
             "date": formatted_date,
             "category": self.category
         }
 
+    @classmethod
+    async def to_dicts(
+        cls, items: Sequence["NewsSchema"], bot: commands.Bot
+    ) -> List[dict[str, int | str | None]]:
+        """Serialize a whole result set with one batched user lookup."""
+        users = await cls.resolve_users(bot, items)
+        return [item._to_dict(users) for item in items]
+
+    async def to_dict(self, bot: commands.Bot) -> dict[str, int | str | None]:
+        return (await type(self).to_dicts([self], bot))[0]
+
 
     @classmethod
     def set_bot(cls, bot_instance: commands.Bot) -> None:
         cls.bot = bot_instance
 
     @classmethod
-    async def filter_by_language(cls, lang: str) -> Sequence["NewsSchema"]:
-        return await cls.filter(language=lang).order_by("-date")
+    async def filter_by_language(
+        cls, lang: str, before: Optional[datetime] = None, limit: int = 50
+    ) -> Sequence["NewsSchema"]:
+        """
+        One page of news in `lang`, newest first. Pass the date of the last item
+        as `before` to get the next page (keyset, so no OFFSET scan).
+        """
+        query = cls.filter(language=lang)
+        if before is not None:
+            query = query.filter(date__lt=before)
+        return await query.order_by("-date").limit(limit)
 
     @classmethod
     async def get_recent_by_language(cls, lang: str, limit: int = 10) -> Sequence["NewsSchema"]:
@@ -219,21 +406,23 @@ class NewsSchema(models.Model):
         nation:  Optional[str] = None,
         author:  Optional[str] = None,
         lang:    Optional[str] = None,
-        category: Optional[str] = None
+        category: Optional[str] = None,
+        limit:   int = 10
     ) -> Sequence["NewsSchema"]:
-        filters = Q()
+        # plain kwargs are ANDed in one pass, no chain of compound Q nodes
+        filters: Dict[str, str] = {}
         if topic:
-            filters &= Q(title__icontains=topic)
+            filters["title__icontains"] = topic
         if nation:
-            filters &= Q(description__icontains=nation)
+            filters["description__icontains"] = nation
         if author:
-            filters &= Q(reporter__icontains=author)
+            filters["reporter__icontains"] = author
         if lang:
-            filters &= Q(language=lang)
+            filters["language"] = lang
         if category:
-            filters &= Q(category=category)
+            filters["category"] = category
 
-        return await cls.filter(filters).order_by("-date").limit(10)
+        return await cls.filter(**filters).order_by("-date").limit(limit)
 
     @classmethod
     async def create_safe(
@@ -268,55 +457,47 @@ class NewsSchema(models.Model):
         term: str,
         limit: int = 10
     ) -> Sequence["NewsSchema"]:
+        try:
+            ids = await cls._fts_search(term, limit)
+        except Exception as e:
+            # e.g. sqlite built without fts5, the scan below still works
+            logger.warning("FTS search failed, falling back to the fuzzy scan: %s", e)
+            ids = []
+        if ids:
+            return await cls.fetch_ordered(ids)
+
+        # no token match, fall back to the fuzzy substring scan
         term_lower = term.lower()
 
         candidates = await cls.filter(
             Q(title__icontains=term_lower) |
             Q(description__icontains=term_lower) |
             Q(category__icontains=term_lower)
-        ).all()
-
-        scored: list[tuple[float, NewsSchema]] = []
-
-        for item in candidates:
-            title_text = item.title.lower()
-            desc_text = item.description.lower()
-            cat_text = item.category.lower()
-
-            title_ratio = SequenceMatcher(None, term_lower, title_text).ratio()
-            desc_ratio = SequenceMatcher(None, term_lower, desc_text).ratio()
-            cat_ratio  = SequenceMatcher(None, term_lower, cat_text).ratio()
-
-            bonus = 0.0
-            if term_lower in title_text:
-                bonus += 0.10
-            if term_lower in desc_text:
-                bonus += 0.05
-            if term_lower in cat_text:
-                bonus += 0.03
-
-            combined_score = (
-                0.50 * title_ratio +
-                0.30 * desc_ratio +
-                0.20 * cat_ratio +
-                bonus
-            )
-
-            if combined_score > 0.10:
-                scored.append((combined_score, item))
+        ).values_list("id", "title", "description", "category")
 
-        scored.sort(key=lambda pair: pair[0], reverse=True)
-        top_items = [itm for (_score, itm) in scored[:limit]]
-        return top_items
+        # score on plain tuples in a worker thread so a big scan doesn't stall the
+        # bot and the other requests, only the final `limit` rows get loaded as models
+        ids = await asyncio.to_thread(_rank_candidates, term_lower, candidates, limit)
+        return await cls.fetch_ordered(ids)
     
 
 
-    async def reset_sqlite_autoincrement(self,table_name: str):
+    @classmethod
+    async def reset_sqlite_autoincrement(cls, table_name: str):
+        # the name has to be interpolated, so only accept tables of our own models
+        known = {model._meta.db_table for model in Tortoise.apps.get("models", {}).values()}
+        if table_name not in known:
+            raise ValueError(f"Unknown table {table_name!r}")
+
         conn = Tortoise.get_connection("default")
-        row = await conn.execute_query_dict(f"SELECT MAX(id) AS maxid FROM {table_name}")
-        max_row = row[0]
-        max_id = max_row["maxid"] or 0
-        await conn.execute_script(f"UPDATE sqlite_sequence SET seq = {max_id} WHERE name = '{table_name}'")
+        rows = await conn.execute_query_dict(
+            f'SELECT COALESCE(MAX(id), 0) AS maxid, '
+            f'(SELECT seq FROM sqlite_sequence WHERE name = ?) AS seq FROM "{table_name}"',
+            [table_name],
+        )
+        max_id, seq = rows[0]["maxid"], rows[0]["seq"]
+        if seq is not None and seq != max_id:
+            await conn.execute_query("UPDATE sqlite_sequence SET seq = ? WHERE name = ?", [max_id, table_name])
         
     @classmethod
     async def search_with_index(
@@ -328,21 +509,157 @@ class NewsSchema(models.Model):
         if not news_index.is_initialized:
             return await cls.search_all(query, limit)
         
-        candidate_ids = await search_news_fast(query, limit * 2)
+        # the index drops other languages itself, so no need to over-fetch
+        candidate_ids = await search_news_fast(query, limit, language)
         
         if not candidate_ids:
             return []
         
-        news_items = await cls.filter(id__in=candidate_ids).all()
-        
+        query_set = cls.filter(id__in=candidate_ids)
         if language:
-            news_items = [item for item in news_items if item.language.upper() == language.upper()]
+            # filter in sql so rows in other languages are never hydrated
+            query_set = query_set.filter(language__iexact=language)
+        news_items = await query_set
         
-        id_to_item = {item.id: item for item in news_items}
-        ordered_results = [id_to_item[news_id] for news_id in candidate_ids if news_id in id_to_item]
+        # slots keyed in rank order, filled in one pass over the rows
+        ranked: Dict[int, Optional[NewsSchema]] = dict.fromkeys(candidate_ids)
+        for item in news_items:
+            ranked[item.id] = item
         
-        return ordered_results[:limit]
+        return [item for item in ranked.values() if item is not None][:limit]
     
+    @classmethod
+    async def setup_fts(cls) -> None:
+        """
+        Add missing indexes, then set up the news_fts index. If this sqlite build
+        can't do fts, search_all keeps working off the fuzzy scan instead of failing startup.
+        """
+        global _fts_enabled
+        await cls._ensure_indexes()
+        try:
+            await cls._create_fts()
+            _fts_enabled = True
+        except Exception as e:
+            _fts_enabled = False
+            logger.exception("FTS5 unavailable, search_all will use the fuzzy scan")
+            # left over triggers would make every news write fail without fts5
+            try:
+                conn = Tortoise.get_connection("default")
+                await conn.execute_script(
+                    "DROP TRIGGER IF EXISTS news_fts_ai;"
+                    "DROP TRIGGER IF EXISTS news_fts_ad;"
+                    "DROP TRIGGER IF EXISTS news_fts_au;"
+                )
+            except Exception as drop_error:
+                logger.warning("Could not drop news_fts triggers: %s", drop_error)
+
+    @classmethod
+    async def _ensure_indexes(cls) -> None:
+        """
+        generate_schemas skips tables that already exist, so add any Meta.indexes an
+        older database is missing. Indexes tortoise already made are left alone.
+        """
+        table = cls._meta.db_table
+        conn = Tortoise.get_connection("default")
+        existing = set()
+        for index in await conn.execute_query_dict(f'PRAGMA index_list("{table}")'):
+            info = await conn.execute_query_dict(f'PRAGMA index_info("{index["name"]}")')
+            existing.add(tuple(col["name"] for col in sorted(info, key=lambda col: col["seqno"])))
+
+        for columns in _NEWS_INDEXES:
+            if columns in existing:
+                continue
+            await conn.execute_script(
+                f'CREATE INDEX IF NOT EXISTS "idx_{table}_{"_".join(columns)}" '
+                f'ON "{table}" ({", ".join(columns)});'
+            )
+
+    @classmethod
+    async def _create_fts(cls) -> None:
+        """
+        Create the news_fts index over title/description/category and the triggers
+        that keep it in sync, building it from existing rows the first time.
+        """
+        global _fts_trigram
+        table = cls._meta.db_table
+        conn = Tortoise.get_connection("default")
+
+        # the trigram tokenizer (sqlite 3.34+) matches any substring of 3+ chars,
+        # i.e. the same thing as the icontains scan, older builds get word tokens
+        version = await conn.execute_query_dict("SELECT sqlite_version() AS v")
+        _fts_trigram = tuple(int(p) for p in version[0]["v"].split(".")[:2]) >= (3, 34)
+        tokenize = "trigram" if _fts_trigram else "unicode61"
+
+        existing = await conn.execute_query_dict(
+            "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'news_fts'"
+        )
+        if existing and f"tokenize='{tokenize}'" not in existing[0]["sql"]:
+            # built with the other tokenizer, recreate it and let the rebuild below refill it
+            await conn.execute_script("DROP TABLE news_fts;")
+
+        await conn.execute_script(f"""
+            CREATE VIRTUAL TABLE IF NOT EXISTS news_fts USING fts5(
+                title, description, category, content='{table}', content_rowid='id',
+                tokenize='{tokenize}'
+            );
+            CREATE TRIGGER IF NOT EXISTS news_fts_ai AFTER INSERT ON {table} BEGIN
+                INSERT INTO news_fts(rowid, title, description, category)
+                VALUES (new.id, new.title, new.description, new.category);
+            END;
+            CREATE TRIGGER IF NOT EXISTS news_fts_ad AFTER DELETE ON {table} BEGIN
+                INSERT INTO news_fts(news_fts, rowid, title, description, category)
+                VALUES ('delete', old.id, old.title, old.description, old.category);
+            END;
+            CREATE TRIGGER IF NOT EXISTS news_fts_au AFTER UPDATE ON {table} BEGIN
+                INSERT INTO news_fts(news_fts, rowid, title, description, category)
+                VALUES ('delete', old.id, old.title, old.description, old.category);
+                INSERT INTO news_fts(rowid, title, description, category)
+                VALUES (new.id, new.title, new.description, new.category);
+            END;
+        """)
+        indexed = await conn.execute_query_dict("SELECT COUNT(*) AS n FROM news_fts_docsize")
+        rows = await conn.execute_query_dict(f"SELECT COUNT(*) AS n FROM {table}")
+        if indexed[0]["n"] != rows[0]["n"]:
+            await conn.execute_script("INSERT INTO news_fts(news_fts) VALUES ('rebuild');")
+
+    @classmethod
+    async def _fts_search(cls, term: str, limit: int) -> List[int]:
+        # quote every word so user input can't inject fts syntax. with trigrams a
+        # quoted word is already a substring match, but needs at least 3 chars
+        if not _fts_enabled:
+            return []
+        tokens = [t.replace('"', '""') for t in term.split()]
+        if _fts_trigram:
+            tokens = [t for t in tokens if len(t) >= 3]
+            match = " ".join(f'"{t}"' for t in tokens)
+        else:
+            match = " ".join(f'"{t}"*' for t in tokens)
+        if not tokens:
+            return []
+        conn = Tortoise.get_connection("default")
+        rows = await conn.execute_query_dict(
+            "SELECT rowid AS id FROM news_fts WHERE news_fts MATCH ? "
+            "ORDER BY bm25(news_fts, 5.0, 3.0, 2.0) LIMIT ?",
+            [match, limit],
+        )
+        return [row["id"] for row in rows]
+
+    @classmethod
+    async def fetch_ordered(cls, ids: Sequence[int]) -> Sequence["NewsSchema"]:
+        """
+        Fetch news by id in the order given (e.g. search rank), letting SQLite
+        do the ordering instead of re-sorting the rows in Python.
+        """
+        if not ids:
+            return []
+        # ids come from our own index, int() keeps the interpolation safe
+        id_list = ",".join(str(int(i)) for i in ids)
+        ranks = " ".join(f"WHEN {int(i)} THEN {rank}" for rank, i in enumerate(ids))
+        return await cls.raw(
+            f"SELECT * FROM {cls._meta.db_table} WHERE id IN ({id_list}) "
+            f"ORDER BY CASE id {ranks} END"
+        )  # type: ignore
+
     @classmethod
     async def create_with_index(cls, **kwargs):
         """Create a news item and add it to the search index"""
@@ -356,11 +673,20 @@ class NewsSchema(models.Model):
         await self.delete()
 
 
+# guild_id -> (expires_at, channels map or None when the guild isn't registered)
+_CHANNELS_CACHE_TTL = 30.0
+_channels_cache: Dict[int, Tuple[float, Optional[Dict[str, int]]]] = {}
+
+# (expires_at, all_by_key result); subscriptions change far less often than news is posted
+_SUBS_CACHE_TTL = 30.0
+_subs_cache: Optional[Tuple[float, Dict[str, Tuple[Dict[str, int], ...]]]] = None
+
+
 class GuildSettings(models.Model):
 
     id       = fields.IntField(pk=True)
     guild_id = fields.BigIntField(unique=True)
-    channels = fields.JSONField(default=dict)
+    channels = fields.JSONField(default=dict, encoder=_json_dumps, decoder=_json_loads)
 
     @classmethod
     async def add_or_update_channel(
@@ -379,6 +705,7 @@ class GuildSettings(models.Model):
 
         obj.channels[key] = channel_id
         await obj.save()
+        cls.cache_channels(guild_id, obj.channels)
 
     @classmethod
     async def remove_channel(
@@ -397,39 +724,79 @@ class GuildSettings(models.Model):
         if key in obj.channels:
             del obj.channels[key]
             await obj.save()
+            cls.cache_channels(guild_id, obj.channels)
+
+    @classmethod
+    async def replace_channels(
+        cls: Type[GuildSettings],
+        guild_id: int,
+        channels: Dict[str, int]
+    ) -> None:
+        """Overwrite the whole channels map with a single UPDATE."""
+        await cls.filter(guild_id=guild_id).update(channels=channels)
+        cls.cache_channels(guild_id, channels)
 
     @classmethod
     async def get_channels_for_guild(
         cls: Type[GuildSettings],
         guild_id: int
     ) -> Optional[Dict[str, int]]:
+        now = time.monotonic()
+        cached = _channels_cache.get(guild_id)
+        if cached is not None and cached[0] > now:
+            channels = cached[1]
+            return dict(channels) if channels is not None else None
+
         try:
             obj = await cls.get(guild_id=guild_id)
         except DoesNotExist:
+            _channels_cache[guild_id] = (now + _CHANNELS_CACHE_TTL, None)
             return None
 
-        if isinstance(obj.channels, dict):
-            return dict(obj.channels)
-        return {}
+        channels = dict(obj.channels) if isinstance(obj.channels, dict) else {}
+        _channels_cache[guild_id] = (now + _CHANNELS_CACHE_TTL, channels)
+        return dict(channels)
+
+    @classmethod
+    def cache_channels(cls: Type[GuildSettings], guild_id: int, channels: Dict[str, int]) -> None:
+        """Seed the cache with a map we just wrote so the next read skips the DB."""
+        global _subs_cache
+        _channels_cache[guild_id] = (time.monotonic() + _CHANNELS_CACHE_TTL, dict(channels))
+        _subs_cache = None
+
+    @classmethod
+    def invalidate_channels_cache(cls: Type[GuildSettings], guild_id: int) -> None:
+        """Drop the cached channels map, call after writing to a guild's row."""
+        global _subs_cache
+        _channels_cache.pop(guild_id, None)
+        _subs_cache = None
 
     @classmethod
     async def all_by_key(
         cls: Type[GuildSettings]
-    ) -> Dict[str, List[Dict[str, int]]]:
-        records: List[GuildSettings] = await cls.all()
+    ) -> Dict[str, Tuple[Dict[str, int], ...]]:
+        """
+        Group every subscribed channel by key. Buckets are built once as tuples
+        when the cache fills so callers can concatenate them directly; the
+        result is shared between callers, so treat it as read-only.
+        """
+        global _subs_cache
+        now = time.monotonic()
+        if _subs_cache is not None and _subs_cache[0] > now:
+            return _subs_cache[1]
+
+        # let sqlite unpack the json so only (guild, key, channel) triples come back
+        conn = Tortoise.get_connection("default")
+        rows = await conn.execute_query_dict(
+            f"SELECT g.guild_id, j.key, j.value FROM {cls._meta.db_table} AS g, json_each(g.channels) AS j "
+            "WHERE json_type(g.channels) = 'object' AND j.type = 'integer'"
+        )
         out: Dict[str, List[Dict[str, int]]] = {}
+        for row in rows:
+            out.setdefault(row["key"], []).append(
+                {"guild_id": row["guild_id"], "channel_id": row["value"]}
+            )
 
-        for rec in records:
-            mapping: Any = rec.channels or {}
-            if not isinstance(mapping, dict):
-                continue
-
-            for key_name, ch_id in mapping.items():
-                if isinstance(ch_id, int):
-                    entry: Dict[str, int] = {
-                        "guild_id": rec.guild_id,
-                        "channel_id": ch_id
-                    }
-                    out.setdefault(key_name, []).append(entry)
-
-        return out
+        buckets = {key_name: tuple(entries) for key_name, entries in out.items()}
+        _subs_cache = (now + _SUBS_CACHE_TTL, buckets)
+        return buckets
@@ -7,28 +7,37 @@
 import re
 import asyncio
 from typing import Dict, Set, List, Optional, Tuple
-from collections import defaultdict
+from collections import Counter, defaultdict
+from itertools import chain
+import heapq
 import string
-from dataclasses import dataclass
 import logging
 
 logger = logging.getLogger(__name__)
 
-@dataclass
-class IndexEntry:
-    """Represents a document in the index with its relevance scores"""
-    news_id: int
-    title_matches: int = 0
-    description_matches: int = 0
-    category_matches: int = 0
-    total_score: float = 0.0
-
 class ReverseIndex:
     """
     High-performance reverse index for news search.
     Maintains an in-memory inverted index that maps terms to document IDs.
     """
     
+    # Stop words to ignore
+    stop_words = frozenset({
+        'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for',
+        'of', 'with', 'by', 'from', 'up', 'about', 'into', 'through', 'during',
+        'before', 'after', 'above', 'below', 'between', 'among', 'through',
+        'during', 'before', 'after', 'above', 'below', 'up', 'down', 'out',
+        'off', 'over', 'under', 'again', 'further', 'then', 'once', 'here',
+        'there', 'when', 'where', 'why', 'how', 'all', 'any', 'both', 'each',
+        'few', 'more', 'most', 'other', 'some', 'such', 'no', 'nor', 'not',
+        'only', 'own', 'same', 'so', 'than', 'too', 'very', 'can', 'will',
+        'just', 'should', 'now'
+    })
+
+    # A term is any run of 3+ word characters. \w keeps non-latin languages working,
+    # and one findall does the punctuation strip, split and length filter at once
+    _TOKEN_RE = re.compile(r'\w{3,}')
+
     def __init__(self):
         # Core index: term -> set of news IDs that contain this term
         self.title_index: Dict[str, Set[int]] = defaultdict(set)
@@ -38,19 +47,6 @@ class ReverseIndex:
         # Document storage for scoring
         self.documents: Dict[int, Dict[str, str]] = {}
         
-        # Stop words to ignore
-        self.stop_words = {
-            'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for',
-            'of', 'with', 'by', 'from', 'up', 'about', 'into', 'through', 'during',
-            'before', 'after', 'above', 'below', 'between', 'among', 'through',
-            'during', 'before', 'after', 'above', 'below', 'up', 'down', 'out',
-            'off', 'over', 'under', 'again', 'further', 'then', 'once', 'here',
-            'there', 'when', 'where', 'why', 'how', 'all', 'any', 'both', 'each',
-            'few', 'more', 'most', 'other', 'some', 'such', 'no', 'nor', 'not',
-            'only', 'own', 'same', 'so', 'than', 'too', 'very', 'can', 'will',
-            'just', 'should', 'now'
-        }
-        
         self.is_initialized = False
     
     def _normalize_text(self, text: str) -> List[str]:
@@ -61,46 +57,43 @@ class ReverseIndex:
         if not text:
             return []
         
-        # Convert to lowercase and remove punctuation
-        text = text.lower()
-        text = re.sub(r'[^\w\s]', ' ', text)
-        
-        # Split into words and filter
-        words = text.split()
-        
-        # Filter out stop words and short words
-        filtered_words = [
-            word for word in words 
-            if len(word) > 2 and word not in self.stop_words
-        ]
-        
-        return filtered_words
+        return [word for word in self._TOKEN_RE.findall(text.lower()) if word not in self.stop_words]
     
     def add_document(self, news_item) -> None:
         """Add a news item to the reverse index"""
-        news_id = news_item.id
-        
+        self.add_document_fields(
+            news_item.id,
+            news_item.title,
+            news_item.description,
+            news_item.category,
+            news_item.language,
+            news_item.region,
+        )
+
+    def add_document_fields(self, news_id: int, title: str, description: str,
+                            category: str, language: str, region) -> None:
+        """Add a document from raw column values, `region` may be a Region or its string value"""
         # Store document for later retrieval
         self.documents[news_id] = {
-            'title': news_item.title,
-            'description': news_item.description,
-            'category': news_item.category,
-            'language': news_item.language,
-            'region': news_item.region.value if news_item.region else 'global'
+            'title': title,
+            'description': description,
+            'category': category,
+            'language': language,
+            'region': getattr(region, 'value', region) or 'global'
         }
         
         # Index title terms
-        title_terms = self._normalize_text(news_item.title)
+        title_terms = self._normalize_text(title)
         for term in title_terms:
             self.title_index[term].add(news_id)
         
         # Index description terms
-        desc_terms = self._normalize_text(news_item.description)
+        desc_terms = self._normalize_text(description)
         for term in desc_terms:
             self.description_index[term].add(news_id)
         
         # Index category terms
-        category_terms = self._normalize_text(news_item.category)
+        category_terms = self._normalize_text(category)
         for term in category_terms:
             self.category_index[term].add(news_id)
     
@@ -135,10 +128,11 @@ class ReverseIndex:
         # Remove document
         del self.documents[news_id]
     
-    def search(self, query: str, limit: int = 10) -> List[Tuple[int, float]]:
+    def search(self, query: str, limit: int = 10, language: Optional[str] = None) -> List[Tuple[int, float]]:
         """
         Search the index for documents matching the query.
         Returns list of (news_id, score) tuples sorted by relevance.
+        With `language`, only documents in that language are scored and returned.
         """
         if not query.strip():
             return []
@@ -147,68 +141,64 @@ class ReverseIndex:
         if not query_terms:
             return []
         
-        # Collect all matching documents with their match counts
-        matches: Dict[int, IndexEntry] = {}
-        
+        # Count hits per field with Counter.update, which runs the loop in C.
+        # `seen` keeps first-match order so equal scores rank as before
+        title_hits: Counter = Counter()
+        description_hits: Counter = Counter()
+        category_hits: Counter = Counter()
+        seen: Dict[int, None] = {}
+
         for term in query_terms:
-            # Title matches (highest weight)
-            for news_id in self.title_index.get(term, set()):
-                if news_id not in matches:
-                    matches[news_id] = IndexEntry(news_id)
-                matches[news_id].title_matches += 1
-            
-            # Description matches (medium weight)
-            for news_id in self.description_index.get(term, set()):
-                if news_id not in matches:
-                    matches[news_id] = IndexEntry(news_id)
-                matches[news_id].description_matches += 1
-            
-            # Category matches (lower weight)
-            for news_id in self.category_index.get(term, set()):
-                if news_id not in matches:
-                    matches[news_id] = IndexEntry(news_id)
-                matches[news_id].category_matches += 1
-        
-        # Calculate relevance scores
-        for entry in matches.values():
+            title_ids = self.title_index.get(term, ())
+            description_ids = self.description_index.get(term, ())
+            category_ids = self.category_index.get(term, ())
+
+            title_hits.update(title_ids)
+            description_hits.update(description_ids)
+            category_hits.update(category_ids)
+            seen.update(dict.fromkeys(chain(title_ids, description_ids, category_ids)))
+
+        query_lower = query.lower()
+        language_upper = language.upper() if language else None
+        scores: Dict[int, float] = {}
+        for news_id in seen:
+            doc = self.documents.get(news_id)
+            if language_upper is not None and (doc is None or doc['language'].upper() != language_upper):
+                continue
+
             # Weighted scoring: title > description > category
-            entry.total_score = (
-                entry.title_matches * 3.0 +
-                entry.description_matches * 1.0 +
-                entry.category_matches * 0.5
+            score = (
+                title_hits[news_id] * 3.0 +
+                description_hits[news_id] * 1.0 +
+                category_hits[news_id] * 0.5
             )
-            
+
             # Bonus for exact query match
-            if news_id in self.documents:
-                doc = self.documents[news_id]
-                query_lower = query.lower()
-                
+            if doc is not None:
                 if query_lower in doc['title'].lower():
-                    entry.total_score += 2.0
+                    score += 2.0
                 elif query_lower in doc['description'].lower():
-                    entry.total_score += 1.0
+                    score += 1.0
                 elif query_lower in doc['category'].lower():
-                    entry.total_score += 0.5
-        
-        # Sort by score and return top results
-        sorted_matches = sorted(
-            matches.values(),
-            key=lambda x: x.total_score,
-            reverse=True
-        )
-        
-        return [(entry.news_id, entry.total_score) for entry in sorted_matches[:limit]]
+                    score += 0.5
+
+            scores[news_id] = score
+
+        # nlargest is a stable partial sort, no need to order every match
+        return heapq.nlargest(limit, scores.items(), key=lambda item: item[1])
     
     async def initialize_from_database(self, NewsSchema) -> None:
         """Initialize the index by loading all existing news items"""
         logger.info("Initializing reverse index from database...")
         
         try:
-            # Load all news items
-            all_news = await NewsSchema.all()
+            # Only the indexed columns, as plain tuples instead of full models
+            rows = await NewsSchema.all().values_list(
+                'id', 'title', 'description', 'category', 'language', 'region'
+            )
             
-            for news_item in all_news:
-                self.add_document(news_item)
+            for row in rows:
+                self.add_document_fields(*row)
             
             self.is_initialized = True
             logger.info(f"Reverse index initialized with {len(self.documents)} documents")
@@ -242,16 +232,16 @@ def remove_news_from_index(news_id: int):
     """Remove a news item from the index (call this when deleting news)"""
     news_index.remove_document(news_id)
 
-async def search_news_fast(query: str, limit: int = 10) -> List[int]:
+async def search_news_fast(query: str, limit: int = 10, language: Optional[str] = None) -> List[int]:
     """
     Fast search using the reverse index.
-    Returns list of news IDs sorted by relevance.
+    Returns list of news IDs sorted by relevance, optionally only in `language`.
     """
     if not news_index.is_initialized:
         logger.warning("Search index not initialized, falling back to database search")
         return []
     
-    results = news_index.search(query, limit)
+    results = news_index.search(query, limit, language)
     return [news_id for news_id, score in results]
 
 # Integration with your existing NewsSchema